@@ -51,6 +51,8 @@ async def main():
 
     print(repr(status))
 
+    await client.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,7 +1,11 @@
-from threading import Lock
-from typing import Callable, List, Optional
+import asyncio
+import functools
+import time
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
 
 from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ConnectionException, ModbusIOException
 
 from .constants import *
 from .exceptions import *
@@ -13,26 +17,354 @@ from .models import (
     HVACMode,
 )
 
+_HVAC_MODES = (
+    HVACMode.OFF,
+    HVACMode.HEAT,
+    HVACMode.COOL,
+    HVACMode.AUTO,
+    HVACMode.FAN_ONLY,
+)
+_SUPPORTED_FEATURES = (
+    ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.FAN_MODE
+)
+
+# Indexed by HR_OPERATION_MODE
+_OPERATION_HVAC_MODES = (HVACMode.FAN_ONLY, HVACMode.HEAT, HVACMode.COOL, HVACMode.AUTO)
+_OPERATION_HVAC_ACTIONS = (HVACAction.FAN, HVACAction.HEATING, HVACAction.COOLING, None)
+
+# Each bank is read in a single window up to the last polled address
+_COILS_WINDOW = (0, max(CL_POWER, CL_Boost_MODE) + 1)
+_HOLDING_REGISTERS_WINDOW = (
+    0,
+    max(HR_MaxSPEED_MODE, HR_SPEED_MODE, HR_ManualSPEED, HR_OPERATION_MODE, HR_SetTEMP)
+    + 1,
+)
+_HOT_INPUT_REGISTERS_WINDOW = (  # Frequently changing ones
+    0,
+    max(IR_CurTEMP_SuAirIn, IR_CurTEMP_SuAirOut, IR_CurRH_Int) + 1,
+)
+
+# Extract the polled values in a single call each
+_get_coil_values = itemgetter(CL_POWER, CL_Boost_MODE)
+_get_holding_register_values = itemgetter(
+    HR_MaxSPEED_MODE, HR_SPEED_MODE, HR_ManualSPEED, HR_OPERATION_MODE, HR_SetTEMP
+)
+_get_input_register_values = itemgetter(
+    IR_CurRH_Int, IR_StateFILTER, IR_ALARM, IR_CurTEMP_SuAirIn, IR_CurTEMP_SuAirOut
+)
+_get_firmware_info = itemgetter(  # Returns a tuple, as needed for caching
+    *range(IR_VerMAIN_FMW_start, IR_VerMAIN_FMW_end + 1)
+)
 
-def _parse_firmware_version(firmware_info: List[int]) -> str:
-    major, minor = firmware_info[0].to_bytes(2, "big")
 
-    day, month = firmware_info[1].to_bytes(2, "big")
-    year: int = firmware_info[2]
+@functools.lru_cache(maxsize=8)  # Firmware does not change between polls
+def _parse_firmware_version(firmware_info: Tuple[int, int, int]) -> str:
+    major_minor, day_month, year = firmware_info
+    major, minor = major_minor >> 8, major_minor & 0xFF
+    day, month = day_month >> 8, day_month & 0xFF
 
     return f"{major}.{minor} ({year}-{month:02d}-{day:02d})"
 
 
+def _check_response(response, operation: str):
+    if response.isError():  # Device rejected the request
+        raise ModbusCommunicationException(f"Modbus {operation} failed: {response}")
+    return response
+
+
+_MBAP_HEADER_SIZE = 7
+_RETRY_DELAYS = (0.05, 0.1)  # Seconds before each retry of a broken call
+
+
+class _ModbusTcpClient(AsyncModbusTcpClient):
+    def callback_data(self, data: bytes, addr: Optional[Tuple] = None) -> int:
+        # pymodbus 3.6 (pinned in setup.py) decodes only one frame per received
+        # chunk and passes a byte of the next frame to the decoder, so responses
+        # to concurrent requests arriving together are handed over one complete
+        # frame at a time
+        used = 0
+        while len(data) - used > _MBAP_HEADER_SIZE:
+            length = int.from_bytes(data[used + 4 : used + 6], "big")  # From unit id
+            end = used + _MBAP_HEADER_SIZE - 1 + length
+            if end > len(data):
+                break
+            self.framer.processIncomingPacket(
+                data[used:end], self._handle_response, slave=0
+            )
+            used = end
+        return used
+
+
+class _SharedConnection:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.users = 0
+        self.client = self._create_client()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._running = False
+        self._close_at: float = 0
+        self._idle_task: Optional[asyncio.Task] = None
+
+    def _create_client(self) -> _ModbusTcpClient:
+        return _ModbusTcpClient(
+            host=self.host,
+            port=self.port,
+            reconnect_delay=0,  # Reconnects are handled in _run_batch
+        )
+
+    def submit(
+        self, func: Callable, idle_timeout: float, read_only: bool = False
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                # Transport of the previous event loop can not be used anymore
+                self.client = self._create_client()
+                self._idle_task = None
+                self._close_at = 0
+            self._loop = loop
+            self._queue = asyncio.Queue()  # Created lazily to bind to the running loop
+            self._drain_task = None
+
+        future = loop.create_future()
+        self._queue.put_nowait((func, read_only, idle_timeout, future))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = loop.create_task(self._drain())
+
+        return future
+
+    async def _drain(self) -> None:
+        # Device does not support multiple connections, so everything goes through
+        # one connection. Calls queued while a batch runs are handled together next.
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            self._running = True
+            try:
+                await self._run_batch(batch)
+            finally:
+                self._running = False
+                for _, _, _, future in batch:
+                    if not future.done():  # Drain task was cancelled
+                        future.set_exception(ConnectionException("Connection closed"))
+
+    async def _run_batch(
+        self, batch: List[Tuple[Callable, bool, float, asyncio.Future]]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        idle_timeout = max(idle_timeout for _, _, idle_timeout, _ in batch)
+        self._close_at = max(self._close_at, loop.time() + idle_timeout)
+
+        # Consecutive reads are sent together, while other calls run one by one
+        # in the order they were queued, so the last write wins
+        start = 0
+        while start < len(batch):
+            end = start + 1
+            if batch[start][1]:
+                while end < len(batch) and batch[end][1]:
+                    end += 1
+            await self._run_calls(batch[start:end])
+            start = end
+
+        self._close_at = max(self._close_at, loop.time() + idle_timeout)
+
+    async def _run_calls(
+        self, calls: List[Tuple[Callable, bool, float, asyncio.Future]]
+    ) -> None:
+        results = await self._run_funcs([func for func, _, _, _ in calls])
+        for delay in _RETRY_DELAYS:
+            # Timeouts are already retried by pymodbus, so only retry broken connections
+            failed = [
+                index
+                for index, result in enumerate(results)
+                if isinstance(result, ConnectionException)
+            ]
+            if not failed:
+                break
+
+            # Connection is broken, reopen it and try again after a while
+            self.client.close()
+            await asyncio.sleep(delay)
+            retried = await self._run_funcs([calls[index][0] for index in failed])
+            for index, result in zip(failed, retried):
+                results[index] = result
+
+        if any(
+            isinstance(result, (ConnectionException, ModbusIOException))
+            for result in results
+        ):
+            self.client.close()  # Reopen it on next call
+
+        for (_, _, _, future), result in zip(calls, results):
+            if future.done():  # Caller is not waiting anymore
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _run_funcs(self, funcs: List[Callable]) -> List:
+        try:
+            await self._ensure_connected()
+        except Exception as e:
+            return [e] * len(funcs)
+
+        return await asyncio.gather(*(func() for func in funcs), return_exceptions=True)
+
+    async def _ensure_connected(self) -> None:
+        if self.client.connected:
+            return
+
+        if not await self.client.connect():
+            raise Exception("Failed to open connection")
+
+        if self._idle_task is None:
+            self._idle_task = asyncio.get_running_loop().create_task(
+                self._close_when_idle()
+            )
+
+    def close(self) -> None:
+        for task in (self._drain_task, self._idle_task):
+            if task is not None:
+                task.cancel()
+        self._drain_task = None
+        self._idle_task = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(ConnectionException("Connection closed"))
+
+        self.client.close()
+
+    async def _close_when_idle(self) -> None:
+        # Long idle connections break over time and become unusable, so close them
+        loop = asyncio.get_running_loop()
+        while loop.time() < self._close_at or self._running:
+            await asyncio.sleep(max(self._close_at - loop.time(), 0.1))
+            if not self.client.connected:  # Already closed after an error
+                break
+
+        self._idle_task = None
+        self.client.close()
+
+
+# Clients of devices behind the same gateway share a single TCP connection
+_CONNECTIONS: Dict[Tuple[str, int], _SharedConnection] = {}
+
+
+def _acquire_connection(host: str, port: int) -> _SharedConnection:
+    connection = _CONNECTIONS.get((host, port))
+    if connection is None:
+        connection = _CONNECTIONS[(host, port)] = _SharedConnection(host, port)
+
+    connection.users += 1
+    return connection
+
+
+def _release_connection(connection: _SharedConnection) -> None:
+    connection.users -= 1
+    if connection.users == 0:
+        del _CONNECTIONS[(connection.host, connection.port)]
+        connection.close()
+
+
 class S21Client:
-    def __init__(self, host: str, port: int = 502):
+    def __init__(
+        self,
+        host: str,
+        port: int = 502,
+        idle_timeout: float = 60.0,
+        unit_id: int = 0,
+        cold_refresh_every: int = 10,
+        poll_ttl: float = 0.5,
+    ):
         self.host = host
         self.port = port
-        self.client = AsyncModbusTcpClient(host=self.host, port=self.port)
+        self.idle_timeout = idle_timeout
+        self.unit_id = unit_id
+        self.cold_refresh_every = cold_refresh_every  # Polls between full reads
+        self.poll_ttl = poll_ttl  # Seconds a poll result is reused for
         self.device: Optional[ClimateDevice] = None
-        self.lock = Lock()
+        self._connection = _acquire_connection(host, port)
+        self._connection_acquired = True
+        self._static_fields = dict(
+            name="Blauberg S21",
+            unique_id=f"S21_{host}_{port}" + (f"_{unit_id}" if unit_id else ""),
+            temperature_unit=TEMP_CELSIUS,  # Seems like no Fahrenheit option is available
+            precision=1,
+            target_temperature_step=1,
+            min_temp=15,
+            max_temp=30,
+            hvac_modes=_HVAC_MODES,
+            supported_features=_SUPPORTED_FEATURES,
+            manufacturer="Blauberg",
+            model="S21",
+        )
+        self._fan_modes_cache: Dict[int, Tuple[int, ...]] = {}
+        self._input_registers: List[int] = []
+        self._polls_until_cold_refresh = 0
+        self._writes = 0  # Calls that may change the state, counted when queued
+        self._polled_at = float("-inf")
+        self._polled_writes = -1
+        self._polled_group: Optional[Tuple[int, int]] = None
+        self._pending_polls: Dict[Tuple[int, int], Tuple[int, asyncio.Task]] = {}
+
+    @property
+    def client(self) -> AsyncModbusTcpClient:
+        return self._connection.client
 
-    async def poll(self) -> ClimateDevice:
-        return await self._do_with_connection(self._poll)
+    async def poll(self, group: Tuple[int, int] = POLL_GROUP_FULL) -> ClimateDevice:
+        if group not in (POLL_GROUP_BASIC, POLL_GROUP_FULL):
+            raise ValueError(f"Unsupported poll group: {group}")
+
+        # Several entities may ask for the state at once, reuse a fresh result
+        if (
+            self.device is not None
+            and self.device.available
+            and self._polled_group in (group, POLL_GROUP_FULL)
+            and self._polled_writes == self._writes
+            and time.monotonic() - self._polled_at < self.poll_ttl
+        ):
+            return self.device
+
+        # Or join the poll already in flight, unless a write was queued since
+        pending = self._pending_polls.get(group)
+        if pending is None or pending[0] != self._writes:
+            writes = self._writes
+            # Queued right away, so the poll keeps its place among other calls
+            future = self._submit(functools.partial(self._poll, group), read_only=True)
+            task = asyncio.ensure_future(
+                self._finish_poll(group, writes, time.monotonic(), future)
+            )
+            pending = self._pending_polls[group] = (writes, task)
+
+        # Cancelling one caller must not cancel the poll for the others
+        return await asyncio.shield(pending[1])
+
+    async def _finish_poll(
+        self,
+        group: Tuple[int, int],
+        writes: int,
+        started_at: float,
+        future: asyncio.Future,
+    ) -> ClimateDevice:
+        try:
+            device = await self._wait_for(future)
+        finally:
+            pending = self._pending_polls.get(group)
+            if pending is not None and pending[1] is asyncio.current_task():
+                del self._pending_polls[group]
+
+        self._polled_at = started_at
+        self._polled_writes = writes
+        self._polled_group = group
+        return device
 
     async def turn_on(self) -> None:
         await self._do_with_connection(self._turn_on)
@@ -41,107 +373,134 @@ class S21Client:
         await self._do_with_connection(self._turn_off)
 
     async def set_hvac_mode(self, hvac_mode: HVACMode) -> None:
-        await self._do_with_connection(lambda: self._set_hvac_mode(hvac_mode))
+        await self._do_with_connection(
+            functools.partial(self._set_hvac_mode, hvac_mode)
+        )
 
     async def set_fan_mode(self, mode: int) -> None:
-        await self._do_with_connection(lambda: self._set_fan_mode(mode))
+        await self._do_with_connection(functools.partial(self._set_fan_mode, mode))
 
     async def set_manual_fan_speed_percent(self, speed_percent: int) -> None:
         await self._do_with_connection(
-            lambda: self._set_manual_fan_speed_percent(speed_percent)
+            functools.partial(self._set_manual_fan_speed_percent, speed_percent)
         )
 
     async def set_temperature(self, temp_celsius: int) -> None:
-        await self._do_with_connection(lambda: self._set_temperature(temp_celsius))
+        await self._do_with_connection(
+            functools.partial(self._set_temperature, temp_celsius)
+        )
 
     async def reset_filter_change_timer(self) -> None:
         await self._do_with_connection(self._reset_filter_change_timer)
 
-    async def _do_with_connection(self, func: Callable):
-        with self.lock:  # Device does not support multiple connections
-            if not await self.client.connect():
-                raise Exception("Failed to open connection")
+    async def close(self) -> None:
+        if self._connection_acquired:
+            self._connection_acquired = False
+            _release_connection(self._connection)
 
-            try:
-                return await func()
-            except Exception:
-                if isinstance(self.device, ClimateDevice):
-                    self.device.available = False
-                raise
-            finally:
-                self.client.close()  # Also, long connections break over time and become unusable
-
-    async def _poll(self) -> ClimateDevice:
-        if (await self.client.read_input_registers(IR_DeviceTYPE)).registers[0] != 1:
-            raise UnsupportedDeviceException("Unsupported device (IR_DeviceTYPE != 1)")
-
-        coils = (await self.client.read_coils(0, 4)).bits
-        holding_registers = (await self.client.read_holding_registers(0, 45)).registers
-        input_registers = (await self.client.read_input_registers(0, 39)).registers
-
-        is_on: bool = coils[CL_POWER]
-        is_boosting: bool = coils[CL_Boost_MODE]
-        set_temperature: int = holding_registers[HR_SetTEMP]
-        current_humidity: int = input_registers[IR_CurRH_Int]
-        filter_state: int = input_registers[IR_StateFILTER]
-        alarm_state: int = input_registers[IR_ALARM]
-        max_fan_level: int = holding_registers[HR_MaxSPEED_MODE]
-        current_fan_level: int = holding_registers[HR_SPEED_MODE]  # 255 - manual
-        temp_before_heating_x10: int = input_registers[IR_CurTEMP_SuAirIn]
-        temp_after_heating_x10: int = input_registers[IR_CurTEMP_SuAirOut]
-        firmware_info: List[int] = input_registers[
-            IR_VerMAIN_FMW_start : IR_VerMAIN_FMW_end + 1
-        ]
-        operation_mode: int = holding_registers[HR_OPERATION_MODE]
-        manual_fan_speed_percent: int = holding_registers[HR_ManualSPEED]
+    async def _do_with_connection(self, func: Callable, read_only: bool = False):
+        return await self._wait_for(self._submit(func, read_only))
+
+    def _submit(self, func: Callable, read_only: bool = False) -> asyncio.Future:
+        if not self._connection_acquired:
+            self._connection = _acquire_connection(self.host, self.port)
+            self._connection_acquired = True
+
+        if not read_only:
+            self._writes += 1  # Invalidate last poll result
+
+        return self._connection.submit(func, self.idle_timeout, read_only)
+
+    async def _wait_for(self, future: asyncio.Future):
+        try:
+            return await future
+        except Exception:
+            if isinstance(self.device, ClimateDevice):
+                self.device.available = False
+            raise
+
+    async def _poll(self, group: Tuple[int, int]) -> ClimateDevice:
+        # Filter, alarm, firmware and device type registers rarely change,
+        # so most polls only read input registers up to humidity or temperatures
+        refresh_cold = not self._input_registers or (
+            group == POLL_GROUP_FULL and self._polls_until_cold_refresh <= 0
+        )
+        if refresh_cold:
+            input_registers_range = POLL_GROUP_FULL
+        elif group == POLL_GROUP_FULL:
+            input_registers_range = _HOT_INPUT_REGISTERS_WINDOW
+        else:
+            input_registers_range = group
+
+        # Requests are independent, so send them at once instead of waiting for each
+        coils, holding_registers, input_registers = await asyncio.gather(
+            self._read_coils(),
+            self._read_holding_registers(),
+            self._read_input_registers(*input_registers_range),
+        )
+
+        if refresh_cold:
+            if input_registers[IR_DeviceTYPE] != 1:
+                raise UnsupportedDeviceException(
+                    "Unsupported device (IR_DeviceTYPE != 1)"
+                )
 
-        self.device = ClimateDevice(
+            self._input_registers = input_registers
+            self._polls_until_cold_refresh = self.cold_refresh_every
+        else:
+            # Registers outside of the group keep their last read values
+            self._input_registers[: len(input_registers)] = input_registers
+            input_registers = self._input_registers
+
+        if group == POLL_GROUP_FULL:
+            self._polls_until_cold_refresh -= 1
+
+        is_on, is_boosting = _get_coil_values(coils)
+        (
+            max_fan_level,
+            current_fan_level,  # 255 - manual
+            manual_fan_speed_percent,
+            operation_mode,
+            set_temperature,
+        ) = _get_holding_register_values(holding_registers)
+        operation_mode = min(operation_mode, 3)  # 3 - auto
+        (
+            current_humidity,
+            filter_state,
+            alarm_state,
+            temp_before_heating_x10,
+            temp_after_heating_x10,
+        ) = _get_input_register_values(input_registers)
+        firmware_info = _get_firmware_info(input_registers)
+
+        if not is_on:
+            hvac_mode = HVACMode.OFF
+            hvac_action = HVACAction.OFF
+        else:
+            hvac_mode = _OPERATION_HVAC_MODES[operation_mode]
+            hvac_action = _OPERATION_HVAC_ACTIONS[operation_mode]
+            if hvac_action is None:  # Auto mode, action depends on temperatures
+                if temp_before_heating_x10 < temp_after_heating_x10:
+                    hvac_action = HVACAction.HEATING
+                elif temp_before_heating_x10 > temp_after_heating_x10:
+                    hvac_action = HVACAction.COOLING
+                else:
+                    hvac_action = HVACAction.IDLE
+
+        fan_modes = self._fan_modes_cache.get(max_fan_level)
+        if fan_modes is None:
+            fan_modes = tuple(range(1, max_fan_level + 1)) + (255,)
+            self._fan_modes_cache[max_fan_level] = fan_modes
+
+        dynamic_fields = dict(
             available=True,
-            name="Blauberg S21",
-            unique_id=f"S21_{self.host}_{self.port}",
-            temperature_unit=TEMP_CELSIUS,  # Seems like no Fahrenheit option is available
-            precision=1,
             current_temperature=temp_after_heating_x10 / 10,
             target_temperature=set_temperature,
-            target_temperature_step=1,
-            min_temp=15,
-            max_temp=30,
             current_humidity=None if current_humidity == 0 else current_humidity,
-            hvac_mode=HVACMode.OFF
-            if not is_on
-            else HVACMode.FAN_ONLY
-            if operation_mode == 0
-            else HVACMode.HEAT
-            if operation_mode == 1
-            else HVACMode.COOL
-            if operation_mode == 2
-            else HVACMode.AUTO,
-            hvac_action=HVACAction.OFF
-            if not is_on
-            else HVACAction.FAN
-            if operation_mode == 0
-            else HVACAction.HEATING
-            if operation_mode == 1
-            else HVACAction.COOLING
-            if operation_mode == 2
-            else HVACAction.HEATING
-            if temp_before_heating_x10 < temp_after_heating_x10
-            else HVACAction.COOLING
-            if temp_before_heating_x10 > temp_after_heating_x10
-            else HVACAction.IDLE,
-            hvac_modes=[
-                HVACMode.OFF,
-                HVACMode.HEAT,
-                HVACMode.COOL,
-                HVACMode.AUTO,
-                HVACMode.FAN_ONLY,
-            ],
+            hvac_mode=hvac_mode,
+            hvac_action=hvac_action,
             fan_mode=current_fan_level,
-            fan_modes=[x + 1 for x in range(max_fan_level)] + [255],
-            supported_features=ClimateEntityFeature.TARGET_TEMPERATURE
-            | ClimateEntityFeature.FAN_MODE,
-            manufacturer="Blauberg",
-            model="S21",
+            fan_modes=fan_modes,
             sw_version=_parse_firmware_version(firmware_info),
             is_boosting=is_boosting,
             current_intake_temperature=temp_before_heating_x10 / 10,
@@ -151,38 +510,86 @@ class S21Client:
             alarm_state=alarm_state,
         )
 
+        if self.device is None:
+            self.device = ClimateDevice(**self._static_fields, **dynamic_fields)
+        else:
+            for name, value in dynamic_fields.items():
+                setattr(self.device, name, value)
+
         return self.device
 
+    async def _read_coils(self) -> List[bool]:
+        response = await self._connection.client.read_coils(
+            *_COILS_WINDOW, slave=self.unit_id
+        )
+        return _check_response(response, "coil read").bits
+
+    async def _read_holding_registers(self) -> List[int]:
+        response = await self._connection.client.read_holding_registers(
+            *_HOLDING_REGISTERS_WINDOW, slave=self.unit_id
+        )
+        return _check_response(response, "holding register read").registers
+
+    async def _read_input_registers(self, start: int, count: int) -> List[int]:
+        response = await self._connection.client.read_input_registers(
+            start, count, slave=self.unit_id
+        )
+        return _check_response(response, "input register read").registers
+
+    async def _write_coil(self, address: int, value: bool) -> None:
+        response = await self._connection.client.write_coil(
+            address, value, slave=self.unit_id
+        )
+        _check_response(response, "coil write")
+
+    async def _write_register(self, address: int, value: int) -> None:
+        response = await self._connection.client.write_register(
+            address, value, slave=self.unit_id
+        )
+        _check_response(response, "register write")
+
     async def _turn_on(self) -> None:
-        await self.client.write_coil(CL_POWER, True)
+        await self._write_coil(CL_POWER, True)
 
     async def _turn_off(self) -> None:
-        await self.client.write_coil(CL_POWER, False)
+        await self._write_coil(CL_POWER, False)
 
     async def _set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         if hvac_mode == HVACMode.OFF:
             await self._turn_off()
         elif hvac_mode == HVACMode.FAN_ONLY:
-            await self._turn_on()
-            await self.client.write_register(HR_OPERATION_MODE, 0)
+            await self._turn_on_with_operation_mode(0)
         elif hvac_mode == HVACMode.HEAT:
-            await self._turn_on()
-            await self.client.write_register(HR_OPERATION_MODE, 1)
+            await self._turn_on_with_operation_mode(1)
         elif hvac_mode == HVACMode.COOL:
-            await self._turn_on()
-            await self.client.write_register(HR_OPERATION_MODE, 2)
+            await self._turn_on_with_operation_mode(2)
         elif hvac_mode == HVACMode.AUTO:
-            await self._turn_on()
-            await self.client.write_register(HR_OPERATION_MODE, 3)
+            await self._turn_on_with_operation_mode(3)
+
+    async def _turn_on_with_operation_mode(self, operation_mode: int) -> None:
+        # Both writes are started before waiting for either, so they are sent
+        # back-to-back in this order. Power is always written, the device may
+        # have been turned off since the last poll
+        writes = [
+            asyncio.ensure_future(self._write_coil(CL_POWER, True)),
+            asyncio.ensure_future(
+                self._write_register(HR_OPERATION_MODE, operation_mode)
+            ),
+        ]
+
+        for result in await asyncio.gather(*writes, return_exceptions=True):
+            if isinstance(result, BaseException):
+                raise result
 
     async def _set_fan_mode(self, mode: int) -> None:
-        await self.client.write_register(HR_SPEED_MODE, mode)
+        await self._write_register(HR_SPEED_MODE, mode)
 
     async def _set_manual_fan_speed_percent(self, speed_percent: int) -> None:
-        await self.client.write_register(HR_ManualSPEED, speed_percent)
+        await self._write_register(HR_ManualSPEED, speed_percent)
 
     async def _set_temperature(self, temp_celsius: int) -> None:
-        await self.client.write_register(HR_SetTEMP, temp_celsius)
+        await self._write_register(HR_SetTEMP, temp_celsius)
 
     async def _reset_filter_change_timer(self) -> None:
-        await self.client.write_coil(CL_RESET_FILTER_TIMER, True)
+        await self._write_coil(CL_RESET_FILTER_TIMER, True)
+        self._polls_until_cold_refresh = 0  # Read new filter state on next poll
@@ -1,21 +1,39 @@
+from typing import Final
+
 # Coils
-CL_POWER = 0
-CL_Boost_MODE = 3
-CL_RESET_FILTER_TIMER = 17
+CL_POWER: Final = 0
+CL_Boost_MODE: Final = 3
+CL_RESET_FILTER_TIMER: Final = 17
 
 # Holding registers
-HR_MaxSPEED_MODE = 1
-HR_SPEED_MODE = 2
-HR_ManualSPEED = 17
-HR_OPERATION_MODE = 43
-HR_SetTEMP = 44
+HR_MaxSPEED_MODE: Final = 1
+HR_SPEED_MODE: Final = 2
+HR_ManualSPEED: Final = 17
+HR_OPERATION_MODE: Final = 43
+HR_SetTEMP: Final = 44
 
 # Input registers
-IR_CurTEMP_SuAirIn = 1
-IR_CurTEMP_SuAirOut = 2
-IR_CurRH_Int = 10
-IR_StateFILTER = 31
-IR_VerMAIN_FMW_start = 34
-IR_VerMAIN_FMW_end = 36
-IR_DeviceTYPE = 37
-IR_ALARM = 38
+IR_CurTEMP_SuAirIn: Final = 1
+IR_CurTEMP_SuAirOut: Final = 2
+IR_CurRH_Int: Final = 10
+IR_StateFILTER: Final = 31
+IR_VerMAIN_FMW_start: Final = 34
+IR_VerMAIN_FMW_end: Final = 36
+IR_DeviceTYPE: Final = 37
+IR_ALARM: Final = 38
+
+# Input register ranges (start, count) read by poll
+POLL_GROUP_BASIC: Final = (0, max(IR_CurTEMP_SuAirIn, IR_CurTEMP_SuAirOut) + 1)
+POLL_GROUP_FULL: Final = (
+    0,
+    max(
+        IR_CurTEMP_SuAirIn,
+        IR_CurTEMP_SuAirOut,
+        IR_CurRH_Int,
+        IR_StateFILTER,
+        IR_VerMAIN_FMW_end,
+        IR_DeviceTYPE,
+        IR_ALARM,
+    )
+    + 1,
+)
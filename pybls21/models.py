@@ -1,5 +1,6 @@
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, NamedTuple, Optional
+from typing import Optional, Sequence
 
 TEMP_CELSIUS: str = "°C"
 
@@ -25,7 +26,38 @@ class HVACAction(str, Enum):
     OFF = "off"
 
 
-class ClimateDevice(NamedTuple):
+@dataclass
+class ClimateDevice:
+    # dataclass(slots=True) requires Python 3.10
+    __slots__ = (
+        "available",
+        "name",
+        "unique_id",
+        "temperature_unit",
+        "precision",
+        "current_temperature",
+        "target_temperature",
+        "target_temperature_step",
+        "max_temp",
+        "min_temp",
+        "current_humidity",
+        "hvac_mode",
+        "hvac_action",
+        "hvac_modes",
+        "fan_mode",
+        "fan_modes",
+        "supported_features",
+        "manufacturer",
+        "model",
+        "sw_version",
+        "is_boosting",
+        "current_intake_temperature",
+        "manual_fan_speed_percent",
+        "max_fan_level",
+        "filter_state",
+        "alarm_state",
+    )
+
     available: bool
     name: str
     unique_id: str
@@ -39,9 +71,9 @@ class ClimateDevice(NamedTuple):
     current_humidity: Optional[float]
     hvac_mode: str
     hvac_action: str
-    hvac_modes: List[str]
+    hvac_modes: Sequence[str]
     fan_mode: Optional[int]
-    fan_modes: Optional[List[int]]
+    fan_modes: Optional[Sequence[int]]
     supported_features: int
     manufacturer: str
     model: Optional[str]
@@ -1,12 +1,55 @@
+import asyncio
+import dataclasses
 import unittest
 
 from pyModbusTCP.server import DataBank, ModbusServer
 
-from pybls21.client import S21Client
+from pybls21.client import S21Client, _ModbusTcpClient
 from pybls21.constants import *
 from pybls21.exceptions import *
 from pybls21.models import ClimateDevice, ClimateEntityFeature, HVACAction, HVACMode
 
+try:
+    import uvloop  # Optional, makes the event loop faster
+except ImportError:
+    uvloop = None
+
+_EXPECTED_POLL_DEVICE = ClimateDevice(
+    available=True,
+    name="Blauberg S21",
+    unique_id="",  # Depends on the test server
+    temperature_unit="°C",
+    precision=1,
+    current_temperature=19.2,
+    target_temperature=15,
+    target_temperature_step=1,
+    min_temp=15,
+    max_temp=30,
+    current_humidity=None,
+    hvac_mode=HVACMode.FAN_ONLY,
+    hvac_action=HVACAction.FAN,
+    hvac_modes=(
+        HVACMode.OFF,
+        HVACMode.HEAT,
+        HVACMode.COOL,
+        HVACMode.AUTO,
+        HVACMode.FAN_ONLY,
+    ),
+    fan_mode=2,
+    fan_modes=(1, 2, 3, 255),
+    supported_features=ClimateEntityFeature.TARGET_TEMPERATURE
+    | ClimateEntityFeature.FAN_MODE,
+    manufacturer="Blauberg",
+    model="S21",
+    sw_version="0.36 (2019-05-08)",
+    is_boosting=False,
+    current_intake_temperature=10.8,
+    manual_fan_speed_percent=100,
+    max_fan_level=3,
+    filter_state=3,
+    alarm_state=2,
+)
+
 
 class TestClient(unittest.IsolatedAsyncioTestCase):
     @classmethod
@@ -16,214 +59,190 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
         )
         cls.server.start()
 
+        cls.event_loop_policy = asyncio.get_event_loop_policy()
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     @classmethod
     def tearDownClass(cls):
+        asyncio.set_event_loop_policy(cls.event_loop_policy)
         cls.server.stop()
 
     def setUp(self):
         self.server.data_bank.reset()
 
+    def create_client(self, **kwargs) -> S21Client:
+        kwargs.setdefault("port", self.server.port)
+        kwargs.setdefault("poll_ttl", 0)
+        client = S21Client(host=self.server.host, **kwargs)
+        self.addAsyncCleanup(client.close)
+        return client
+
     async def test_poll_when_device_type_is_incorrect_raises_exception(self):
         self.server.data_bank.set_input_registers(IR_DeviceTYPE, [0])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         with self.assertRaises(UnsupportedDeviceException):
             await client.poll()
 
     async def test_poll(self):
-        self.server.data_bank.set_coils(CL_POWER, [True])
-        self.server.data_bank.set_coils(CL_Boost_MODE, [False])
-        self.server.data_bank.set_holding_registers(HR_SetTEMP, [15])
-        self.server.data_bank.set_holding_registers(HR_MaxSPEED_MODE, [3])
-        self.server.data_bank.set_holding_registers(HR_SPEED_MODE, [2])
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [0])
-        self.server.data_bank.set_holding_registers(HR_ManualSPEED, [100])
-        self.server.data_bank.set_input_registers(IR_CurRH_Int, [0])
-        self.server.data_bank.set_input_registers(IR_StateFILTER, [3])
-        self.server.data_bank.set_input_registers(IR_ALARM, [2])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [108])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [192])
-        self.server.data_bank.set_input_registers(
-            IR_VerMAIN_FMW_start, [36, 2053, 2019]
+        self.server.data_bank.seed(
+            coils={CL_POWER: True, CL_Boost_MODE: False},
+            holding_registers={
+                HR_SetTEMP: 15,
+                HR_MaxSPEED_MODE: 3,
+                HR_SPEED_MODE: 2,
+                HR_OPERATION_MODE: 0,
+                HR_ManualSPEED: 100,
+            },
+            input_registers={
+                IR_CurRH_Int: 0,
+                IR_StateFILTER: 3,
+                IR_ALARM: 2,
+                IR_CurTEMP_SuAirIn: 108,
+                IR_CurTEMP_SuAirOut: 192,
+                IR_VerMAIN_FMW_start: 36,
+                IR_VerMAIN_FMW_start + 1: 2053,
+                IR_VerMAIN_FMW_end: 2019,
+            },
         )
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         device = await client.poll()
 
         self.assertEqual(
             device,
-            ClimateDevice(
-                available=True,
-                name="Blauberg S21",
+            dataclasses.replace(
+                _EXPECTED_POLL_DEVICE,
                 unique_id=f"S21_{self.server.host}_{self.server.port}",
-                temperature_unit="°C",
-                precision=1,
-                current_temperature=19.2,
-                target_temperature=15,
-                target_temperature_step=1,
-                min_temp=15,
-                max_temp=30,
-                current_humidity=None,
-                hvac_mode=HVACMode.FAN_ONLY,
-                hvac_action=HVACAction.FAN,
-                hvac_modes=[
-                    HVACMode.OFF,
-                    HVACMode.HEAT,
-                    HVACMode.COOL,
-                    HVACMode.AUTO,
-                    HVACMode.FAN_ONLY,
-                ],
-                fan_mode=2,
-                fan_modes=[1, 2, 3, 255],
-                supported_features=ClimateEntityFeature.TARGET_TEMPERATURE
-                | ClimateEntityFeature.FAN_MODE,
-                manufacturer="Blauberg",
-                model="S21",
-                sw_version="0.36 (2019-05-08)",
-                is_boosting=False,
-                current_intake_temperature=10.8,
-                manual_fan_speed_percent=100,
-                max_fan_level=3,
-                filter_state=3,
-                alarm_state=2,
             ),
         )
 
-    async def test_poll_when_device_is_off(self):
-        self.server.data_bank.set_coils(CL_POWER, [False])
-
-        client = S21Client(host=self.server.host, port=self.server.port)
-        device = await client.poll()
-
-        self.assertEqual(device.hvac_mode, HVACMode.OFF)
-        self.assertEqual(device.hvac_action, HVACAction.OFF)
-
-    async def test_poll_when_humidity_is_available(self):
-        self.server.data_bank.set_input_registers(IR_CurRH_Int, [42])
-
-        client = S21Client(host=self.server.host, port=self.server.port)
+    async def test_poll_updates_same_device(self):
+        client = self.create_client()
         device = await client.poll()
 
-        self.assertEqual(device.current_humidity, 42)
+        self.server.data_bank.set_holding_registers(HR_SetTEMP, [22])
 
-    async def test_poll_when_ventilation_only_mode_is_set(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [0])
+        self.assertIs(await client.poll(), device)
+        self.assertEqual(device.target_temperature, 22)
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+    async def test_poll_failure_marks_device_unavailable(self):
+        client = self.create_client(cold_refresh_every=1)
         device = await client.poll()
 
-        self.assertEqual(device.hvac_mode, HVACMode.FAN_ONLY)
-        self.assertEqual(device.hvac_action, HVACAction.FAN)
-
-    async def test_poll_when_heating_mode_is_set(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [1])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [5])
-
-        client = S21Client(host=self.server.host, port=self.server.port)
-        device = await client.poll()
+        self.server.data_bank.set_input_registers(IR_DeviceTYPE, [0])
 
-        self.assertEqual(device.hvac_mode, HVACMode.HEAT)
-        self.assertEqual(device.hvac_action, HVACAction.HEATING)
+        with self.assertRaises(UnsupportedDeviceException):
+            await client.poll()
+        self.assertFalse(device.available)
 
-    async def test_poll_when_cooling_mode_is_set(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [2])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [20])
+    async def test_poll_reads_rarely_changing_registers_periodically(self):
+        client = self.create_client(cold_refresh_every=2)
+        await client.poll()
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        self.server.data_bank.seed(
+            input_registers={IR_ALARM: 1, IR_CurTEMP_SuAirOut: 200}
+        )
         device = await client.poll()
 
-        self.assertEqual(device.hvac_mode, HVACMode.COOL)
-        self.assertEqual(device.hvac_action, HVACAction.COOLING)
-
-    async def test_poll_when_auto_mode_is_set_and_output_temperature_is_bigger(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [20])
+        self.assertEqual(device.alarm_state, 0)
+        self.assertEqual(device.current_temperature, 20)
 
-        client = S21Client(host=self.server.host, port=self.server.port)
         device = await client.poll()
 
-        self.assertEqual(device.hvac_mode, HVACMode.AUTO)
-        self.assertEqual(device.hvac_action, HVACAction.HEATING)
+        self.assertEqual(device.alarm_state, 1)
 
-    async def test_poll_when_auto_mode_is_set_and_temperature_is_reached(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [20])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [20])
+    async def test_poll_basic_group_reads_only_temperatures(self):
+        client = self.create_client()
+        await client.poll()
 
-        client = S21Client(host=self.server.host, port=self.server.port)
-        device = await client.poll()
-
-        self.assertEqual(device.hvac_mode, HVACMode.AUTO)
-        self.assertEqual(device.hvac_action, HVACAction.IDLE)
-
-    async def test_poll_when_auto_mode_is_set_and_output_temperature_is_lower(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [5])
-
-        client = S21Client(host=self.server.host, port=self.server.port)
-        device = await client.poll()
-
-        self.assertEqual(device.hvac_mode, HVACMode.AUTO)
-        self.assertEqual(device.hvac_action, HVACAction.COOLING)
+        self.server.data_bank.seed(
+            input_registers={IR_CurTEMP_SuAirOut: 200, IR_CurRH_Int: 42}
+        )
+        device = await client.poll(group=POLL_GROUP_BASIC)
 
-    async def test_poll_when_auto_mode_is_set_and_in_temperature_matches_out_temperature(
-        self,
-    ):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [10])
+        self.assertEqual(device.current_temperature, 20)
+        self.assertIsNone(device.current_humidity)
+        self.assertEqual(device.sw_version, "0.0 (0-00-00)")
 
-        client = S21Client(host=self.server.host, port=self.server.port)
         device = await client.poll()
 
-        self.assertEqual(device.hvac_mode, HVACMode.AUTO)
-        self.assertEqual(device.hvac_action, HVACAction.IDLE)
-
-    async def test_poll_when_auto_mode_is_set_and_in_temperature_is_cooler_than_out_temperature(
-        self,
-    ):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [5])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [10])
+        self.assertEqual(device.current_humidity, 42)
 
-        client = S21Client(host=self.server.host, port=self.server.port)
-        device = await client.poll()
+    async def test_poll_basic_group_checks_device_type_first(self):
+        self.server.data_bank.set_input_registers(IR_DeviceTYPE, [0])
 
-        self.assertEqual(device.hvac_mode, HVACMode.AUTO)
-        self.assertEqual(device.hvac_action, HVACAction.HEATING)
+        client = self.create_client()
+        with self.assertRaises(UnsupportedDeviceException):
+            await client.poll(group=POLL_GROUP_BASIC)
+
+    async def test_poll_unknown_group_raises_exception(self):
+        client = self.create_client()
+        with self.assertRaises(ValueError):
+            await client.poll(group=(5, 10))
+
+    async def test_poll_hvac_mode_and_action(self):
+        cases = [
+            # Power, operation mode, temperature in and out, HVAC mode and action
+            (False, 0, 0, 0, HVACMode.OFF, HVACAction.OFF),
+            (True, 0, 0, 0, HVACMode.FAN_ONLY, HVACAction.FAN),
+            (True, 1, 10, 5, HVACMode.HEAT, HVACAction.HEATING),
+            (True, 2, 10, 20, HVACMode.COOL, HVACAction.COOLING),
+            (True, 3, 5, 10, HVACMode.AUTO, HVACAction.HEATING),
+            (True, 3, 10, 20, HVACMode.AUTO, HVACAction.HEATING),
+            (True, 3, 10, 10, HVACMode.AUTO, HVACAction.IDLE),
+            (True, 3, 20, 20, HVACMode.AUTO, HVACAction.IDLE),
+            (True, 3, 10, 5, HVACMode.AUTO, HVACAction.COOLING),
+            (True, 4, 0, 0, HVACMode.AUTO, HVACAction.IDLE),  # Unknown mode
+        ]
+
+        # Polls only read the state, so one client serves all cases
+        client = self.create_client()
+        for power, operation_mode, temp_in, temp_out, hvac_mode, hvac_action in cases:
+            with self.subTest(
+                power=power,
+                operation_mode=operation_mode,
+                temp_in=temp_in,
+                temp_out=temp_out,
+            ):
+                self.server.data_bank.seed(
+                    coils={CL_POWER: power},
+                    holding_registers={HR_OPERATION_MODE: operation_mode},
+                    input_registers={
+                        IR_CurTEMP_SuAirIn: temp_in,
+                        IR_CurTEMP_SuAirOut: temp_out,
+                    },
+                )
+                device = await client.poll()
+
+                self.assertEqual(device.hvac_mode, hvac_mode)
+                self.assertEqual(device.hvac_action, hvac_action)
 
-    async def test_poll_when_auto_mode_is_set_and_in_temperature_is_hotter_than_out_temperature(
-        self,
-    ):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [5])
+    async def test_poll_when_humidity_is_available(self):
+        self.server.data_bank.set_input_registers(IR_CurRH_Int, [42])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         device = await client.poll()
 
-        self.assertEqual(device.hvac_mode, HVACMode.AUTO)
-        self.assertEqual(device.hvac_action, HVACAction.COOLING)
+        self.assertEqual(device.current_humidity, 42)
 
     async def test_poll_when_is_boosting(self):
         self.server.data_bank.set_coils(CL_Boost_MODE, [True])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         device = await client.poll()
 
         self.assertTrue(device.is_boosting)
 
     async def test_turn_on(self):
-        self.server.data_bank.set_coils(CL_POWER, [False])
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [10])
+        self.server.data_bank.seed(
+            coils={CL_POWER: False},
+            holding_registers={HR_OPERATION_MODE: 3},
+            input_registers={IR_CurTEMP_SuAirIn: 10, IR_CurTEMP_SuAirOut: 10},
+        )
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.turn_on()
         device = await client.poll()
 
@@ -233,7 +252,7 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
     async def test_turn_off(self):
         self.server.data_bank.set_coils(CL_POWER, [True])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.turn_off()
         device = await client.poll()
 
@@ -243,7 +262,7 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
     async def test_set_hvac_mode_off(self):
         self.server.data_bank.set_coils(CL_POWER, [True])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_hvac_mode(HVACMode.OFF)
         device = await client.poll()
 
@@ -251,11 +270,12 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(device.hvac_action, HVACAction.OFF)
 
     async def test_set_hvac_mode_heat(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [20])
+        self.server.data_bank.seed(
+            holding_registers={HR_OPERATION_MODE: 3},
+            input_registers={IR_CurTEMP_SuAirIn: 10, IR_CurTEMP_SuAirOut: 20},
+        )
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_hvac_mode(HVACMode.HEAT)
         device = await client.poll()
 
@@ -263,11 +283,12 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(device.hvac_action, HVACAction.HEATING)
 
     async def test_set_hvac_mode_cool(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [5])
+        self.server.data_bank.seed(
+            holding_registers={HR_OPERATION_MODE: 3},
+            input_registers={IR_CurTEMP_SuAirIn: 10, IR_CurTEMP_SuAirOut: 5},
+        )
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_hvac_mode(HVACMode.COOL)
         device = await client.poll()
 
@@ -275,11 +296,12 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(device.hvac_action, HVACAction.COOLING)
 
     async def test_set_hvac_mode_auto(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [1])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [20])
+        self.server.data_bank.seed(
+            holding_registers={HR_OPERATION_MODE: 1},
+            input_registers={IR_CurTEMP_SuAirIn: 10, IR_CurTEMP_SuAirOut: 20},
+        )
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_hvac_mode(HVACMode.AUTO)
         device = await client.poll()
 
@@ -287,21 +309,50 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(device.hvac_action, HVACAction.HEATING)
 
     async def test_set_hvac_mode_fan_only(self):
-        self.server.data_bank.set_holding_registers(HR_OPERATION_MODE, [3])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirIn, [10])
-        self.server.data_bank.set_input_registers(IR_CurTEMP_SuAirOut, [20])
+        self.server.data_bank.seed(
+            holding_registers={HR_OPERATION_MODE: 3},
+            input_registers={IR_CurTEMP_SuAirIn: 10, IR_CurTEMP_SuAirOut: 20},
+        )
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_hvac_mode(HVACMode.FAN_ONLY)
         device = await client.poll()
 
         self.assertEqual(device.hvac_mode, HVACMode.FAN_ONLY)
         self.assertEqual(device.hvac_action, HVACAction.FAN)
 
+    async def test_set_hvac_mode_after_turn_off(self):
+        client = self.create_client()
+        await client.poll()
+        await client.turn_off()
+        await client.set_hvac_mode(HVACMode.HEAT)
+        device = await client.poll()
+
+        self.assertEqual(device.hvac_mode, HVACMode.HEAT)
+
+    async def test_set_hvac_mode_after_device_turned_off_elsewhere(self):
+        client = self.create_client()
+        await client.poll()
+        self.server.data_bank.set_coils(CL_POWER, [False])
+        await client.set_hvac_mode(HVACMode.HEAT)
+
+        self.assertEqual(self.server.data_bank.get_coils(CL_POWER), [True])
+
+    async def test_set_hvac_mode_followed_by_turn_off(self):
+        self.server.data_bank.set_coils(CL_POWER, [False])
+
+        client = self.create_client()
+        await asyncio.gather(client.set_hvac_mode(HVACMode.HEAT), client.turn_off())
+
+        self.assertEqual(self.server.data_bank.get_coils(CL_POWER), [False])
+        self.assertEqual(
+            self.server.data_bank.get_holding_registers(HR_OPERATION_MODE), [1]
+        )
+
     async def test_set_fan_mode_level2(self):
         self.server.data_bank.set_holding_registers(HR_SPEED_MODE, [1])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_fan_mode(2)
         device = await client.poll()
 
@@ -310,7 +361,7 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
     async def test_set_fan_mode_custom(self):
         self.server.data_bank.set_holding_registers(HR_SPEED_MODE, [1])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_fan_mode(255)
         device = await client.poll()
 
@@ -319,7 +370,7 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
     async def test_set_manual_fan_speed_percent(self):
         self.server.data_bank.set_holding_registers(HR_ManualSPEED, [0])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_manual_fan_speed_percent(42)
         device = await client.poll()
 
@@ -328,12 +379,205 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
     async def test_set_temperature(self):
         self.server.data_bank.set_holding_registers(HR_SetTEMP, [0])
 
-        client = S21Client(host=self.server.host, port=self.server.port)
+        client = self.create_client()
         await client.set_temperature(20)
         device = await client.poll()
 
         self.assertEqual(device.target_temperature, 20)
 
+    async def test_reset_filter_change_timer(self):
+        self.server.data_bank.set_input_registers(IR_StateFILTER, [3])
+
+        client = self.create_client()
+        await client.poll()
+        self.server.data_bank.set_input_registers(IR_StateFILTER, [0])
+        await client.reset_filter_change_timer()
+        device = await client.poll()
+
+        self.assertTrue(self.server.data_bank.get_coils(CL_RESET_FILTER_TIMER)[0])
+        self.assertEqual(device.filter_state, 0)
+
+    async def test_poll_result_is_reused_until_changed(self):
+        self.server.data_bank.set_holding_registers(HR_SetTEMP, [20])
+
+        client = self.create_client(poll_ttl=60)
+        await client.poll()
+        self.server.data_bank.set_holding_registers(HR_SetTEMP, [21])
+        device = await client.poll()
+
+        self.assertEqual(device.target_temperature, 20)
+
+        await client.set_temperature(22)
+        device = await client.poll()
+
+        self.assertEqual(device.target_temperature, 22)
+
+    async def test_poll_when_device_rejects_read_raises_exception(self):
+        server = ModbusServer(
+            host="localhost",
+            port=5503,
+            no_block=True,
+            data_bank=DataBank(i_regs_size=1),
+        )
+        server.start()
+        self.addCleanup(server.stop)
+
+        client = self.create_client(port=5503)
+        with self.assertRaises(ModbusCommunicationException):
+            await client.poll()
+
+        self.assertTrue(client.client.connected)
+
+    async def test_concurrent_polls_share_one_read(self):
+        client = self.create_client()
+        polls = 0
+        poll = client._poll
+
+        async def counting_poll(group):
+            nonlocal polls
+            polls += 1
+            return await poll(group)
+
+        client._poll = counting_poll
+        devices = await asyncio.gather(*(client.poll() for _ in range(5)))
+
+        self.assertEqual(polls, 1)
+        self.assertTrue(all(device is devices[0] for device in devices))
+
+    async def test_cancelled_poll_does_not_cancel_concurrent_poll(self):
+        client = self.create_client()
+        first = asyncio.ensure_future(client.poll())
+        second = asyncio.ensure_future(client.poll())
+        await asyncio.sleep(0)  # Both polls wait for the same read
+        first.cancel()
+        device = await asyncio.wait_for(second, 1)
+
+        self.assertTrue(first.cancelled())
+        self.assertTrue(device.available)
+
+    async def test_concurrent_poll_after_write_reads_again(self):
+        self.server.data_bank.set_holding_registers(HR_SetTEMP, [20])
+
+        client = self.create_client(poll_ttl=60)
+        _, _, device = await asyncio.gather(
+            client.poll(), client.set_temperature(22), client.poll()
+        )
+
+        self.assertEqual(device.target_temperature, 22)
+
+    async def test_concurrent_calls(self):
+        self.server.data_bank.set_holding_registers(HR_SetTEMP, [0])
+
+        client = self.create_client()
+        _, device, _ = await asyncio.gather(
+            client.set_temperature(20), client.poll(), client.turn_off()
+        )
+
+        self.assertEqual(device.target_temperature, 20)
+        self.assertEqual(device.hvac_mode, HVACMode.FAN_ONLY)
+
+    async def test_calls_are_handled_after_queue_task_stops(self):
+        client = self.create_client()
+        await client.poll()
+
+        client._connection._drain_task.cancel()
+        await asyncio.sleep(0)
+        device = await asyncio.wait_for(client.poll(), 1)
+
+        self.assertTrue(device.available)
+
+    async def test_connection_is_kept_open_between_calls(self):
+        client = self.create_client()
+        await client.poll()
+        await client.poll()
+
+        self.assertTrue(client.client.connected)
+
+        await client.close()
+
+        self.assertFalse(client.client.connected)
+
+    async def test_broken_connection_is_reopened(self):
+        client = self.create_client()
+        await client.poll()
+
+        client.client.transport.close()  # Still looks connected until the next read
+        device = await client.poll()
+
+        self.assertTrue(device.available)
+        self.assertTrue(client.client.connected)
+
+    async def test_clients_of_same_host_share_connection(self):
+        client1 = self.create_client()
+        client2 = self.create_client(unit_id=2)
+        await client1.poll()
+        device = await client2.poll()
+
+        self.assertIs(client1.client, client2.client)
+        self.assertEqual(
+            device.unique_id, f"S21_{self.server.host}_{self.server.port}_2"
+        )
+
+        await client1.close()
+
+        self.assertTrue(client2.client.connected)
+
+        await client2.close()
+
+        self.assertFalse(client2.client.connected)
+
+    async def test_connection_is_closed_when_idle(self):
+        client = self.create_client(idle_timeout=0.1)
+        await client.poll()
+        await asyncio.sleep(0.3)
+
+        self.assertFalse(client.client.connected)
+
+        device = await client.poll()
+
+        self.assertTrue(device.available)
+
+
+class TestModbusTcpClient(unittest.IsolatedAsyncioTestCase):
+    async def test_responses_received_together_are_all_handled(self):
+        payloads = {
+            1: bytes([1, 0b1001]),  # Coils
+            3: bytes([6, 0, 1, 0, 2, 0, 3]),  # Holding registers
+            4: bytes([6, 0, 4, 0, 5, 0, 6]),  # Input registers
+        }
+
+        async def handle(reader, writer):
+            # Answer only when all requests are in, with a single write
+            data = b""
+            for _ in payloads:
+                request = await reader.readexactly(12)
+                pdu = request[7:8] + payloads[request[7]]
+                data += request[:4] + (len(pdu) + 1).to_bytes(2, "big")
+                data += request[6:7] + pdu
+            writer.write(data)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "localhost", 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        client = _ModbusTcpClient("localhost", port=server.sockets[0].getsockname()[1])
+        await client.connect()
+        self.addCleanup(client.close)
+
+        coils, holding_registers, input_registers = await asyncio.wait_for(
+            asyncio.gather(
+                client.read_coils(0, 4),
+                client.read_holding_registers(0, 3),
+                client.read_input_registers(0, 3),
+            ),
+            1,
+        )
+
+        self.assertEqual(coils.bits[:4], [True, False, False, True])
+        self.assertEqual(holding_registers.registers, [1, 2, 3])
+        self.assertEqual(input_registers.registers, [4, 5, 6])
+
 
 class TestDataBank(DataBank):
     __test__ = False
@@ -342,15 +586,45 @@ class TestDataBank(DataBank):
         super().__init__(
             coils_size=25, d_inputs_size=72, h_regs_size=182, i_regs_size=51
         )
+        self._dirty = set()  # Ranges written since the last reset
         self.reset()
 
     def reset(self):
-        # Clear server state
-        self.set_coils(0, [False] * self.coils_size)
-        self.set_discrete_inputs(0, [0] * self.d_inputs_size)
-        self.set_holding_registers(0, [0] * self.h_regs_size)
-        self.set_input_registers(0, [0] * self.i_regs_size)
+        # Clear server state, only ranges written since the last reset are not zero
+        for set_values, address, count in self._dirty:
+            set_values(self, address, [0] * count)
+        self._dirty.clear()
 
         # Set some default values
         self.set_input_registers(IR_DeviceTYPE, [1])
         self.set_coils(CL_POWER, [True])
+
+    def set_coils(self, address, bit_list, srv_info=None):
+        self._dirty.add((DataBank.set_coils, address, len(bit_list)))
+        return super().set_coils(address, bit_list, srv_info)
+
+    def set_discrete_inputs(self, address, bit_list):
+        self._dirty.add((DataBank.set_discrete_inputs, address, len(bit_list)))
+        return super().set_discrete_inputs(address, bit_list)
+
+    def set_holding_registers(self, address, word_list, srv_info=None):
+        self._dirty.add((DataBank.set_holding_registers, address, len(word_list)))
+        return super().set_holding_registers(address, word_list, srv_info)
+
+    def set_input_registers(self, address, word_list):
+        self._dirty.add((DataBank.set_input_registers, address, len(word_list)))
+        return super().set_input_registers(address, word_list)
+
+    def seed(self, coils=None, holding_registers=None, input_registers=None):
+        # Set scattered values with a single write per bank
+        for values, get_values, set_values in (
+            (coils, self.get_coils, self.set_coils),
+            (holding_registers, self.get_holding_registers, self.set_holding_registers),
+            (input_registers, self.get_input_registers, self.set_input_registers),
+        ):
+            if values:
+                start = min(values)
+                block = get_values(start, max(values) - start + 1)
+                for address, value in values.items():
+                    block[address - start] = value
+                set_values(start, block)